@@ -1,21 +1,59 @@
 """Кастомные поля для сериализаторов."""
 
 import base64
+import binascii
+import re
 import uuid
 
 from django.core.files.base import ContentFile
 from rest_framework import serializers
 
+from recipes.cache import bump_version
+
+DATA_URI_RE = re.compile(r'^data:image/(?P<ext>[\w.+-]+);base64,')
+
 
 class Base64ImageField(serializers.ImageField):
     """Поле для обработки изображений в формате Base64."""
 
     def to_internal_value(self, data):
-        if isinstance(data, str) and data.startswith('data:image'):
-            format_part, imgstr = data.split(';base64,')
-            ext = format_part.split('/')[-1]
+        match = isinstance(data, str) and DATA_URI_RE.match(data)
+        if match:
+            try:
+                decoded = base64.b64decode(data[match.end():], validate=True)
+            except (ValueError, binascii.Error):
+                raise serializers.ValidationError(
+                    'Некорректные данные base64.'
+                )
             data = ContentFile(
-                base64.b64decode(imgstr),
-                name=f'{uuid.uuid4()}.{ext}'
+                decoded,
+                name=f'{uuid.uuid4().hex}.{match["ext"]}',
             )
         return super().to_internal_value(data)
+
+
+class CachedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """PrimaryKeyRelatedField, разрешающий pk через процессный кэш.
+
+    Вместо SELECT на каждый pk объект берётся из карты справочника
+    (см. recipes.cache). Промах по карте не означает отсутствия
+    записи: карта могла устареть в этом процессе (запись добавил
+    другой воркер) — тогда pk проверяется запросом к базе, и при
+    попадании карта инвалидируется.
+    """
+
+    def __init__(self, map_getter=None, **kwargs):
+        self.map_getter = map_getter
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            return self.map_getter()[int(data)]
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        except KeyError:
+            instance = super().to_internal_value(data)
+            bump_version(type(instance))
+            return instance
@@ -2,7 +2,7 @@
 
 from django_filters import rest_framework as filters
 
-from recipes.models import Recipe, Ingredient
+from recipes.models import Recipe, Ingredient, Tag
 
 
 class IngredientFilter(filters.FilterSet):
@@ -19,7 +19,11 @@ class RecipeFilter(filters.FilterSet):
     """Фильтр рецептов."""
 
     author = filters.NumberFilter(field_name='author__id')
-    tags = filters.AllValuesMultipleFilter(field_name='tags__slug')
+    tags = filters.ModelMultipleChoiceFilter(
+        field_name='tags__slug',
+        to_field_name='slug',
+        queryset=Tag.objects.all(),
+    )
     is_favorited = filters.BooleanFilter(method='filter_is_favorited')
     is_in_shopping_cart = filters.BooleanFilter(
         method='filter_is_in_shopping_cart'
@@ -30,13 +34,13 @@ class RecipeFilter(filters.FilterSet):
         fields = ('author', 'tags', 'is_favorited', 'is_in_shopping_cart')
 
     def filter_is_favorited(self, queryset, name, value):
-        """Фильтр по избранному."""
+        """Фильтр по аннотированному флагу избранного."""
         if value and self.request.user.is_authenticated:
-            return queryset.filter(in_favorites__user=self.request.user)
+            return queryset.filter(is_favorited=True)
         return queryset
 
     def filter_is_in_shopping_cart(self, queryset, name, value):
-        """Фильтр по списку покупок."""
+        """Фильтр по аннотированному флагу списка покупок."""
         if value and self.request.user.is_authenticated:
-            return queryset.filter(in_shoppingcarts__user=self.request.user)
+            return queryset.filter(is_in_shopping_cart=True)
         return queryset
@@ -1,8 +1,72 @@
 """Кастомная пагинация."""
 
+import hashlib
+from functools import partial
+
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils.functional import cached_property
 from rest_framework.pagination import PageNumberPagination
 
-from core.constants import DEFAULT_PAGE_SIZE
+from core.constants import (
+    DEFAULT_PAGE_SIZE,
+    ESTIMATED_COUNT_MIN_ROWS,
+    PAGE_COUNT_CACHE_TIMEOUT,
+)
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator с оценкой количества строк вместо COUNT(*).
+
+    Для нефильтрованных запросов на PostgreSQL берёт оценку
+    планировщика (reltuples из pg_class) — на больших таблицах это
+    O(1) вместо полного скана. Точный COUNT(*) для отфильтрованных
+    запросов кэшируется по хэшу SQL на короткий срок, чтобы глубокая
+    пагинация не пересчитывала агрегат на каждой странице; на первой
+    странице (refresh_count=True) счётчик всегда пересчитывается и
+    обновляет кэш.
+    """
+
+    def __init__(self, *args, refresh_count=True, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.refresh_count = refresh_count
+
+    @cached_property
+    def count(self):
+        estimate = self._estimate_count()
+        if estimate is not None and estimate >= ESTIMATED_COUNT_MIN_ROWS:
+            return estimate
+        try:
+            query_sql = str(self.object_list.query)
+        except AttributeError:
+            return len(self.object_list)
+        cache_key = 'page_count_{}'.format(
+            hashlib.sha1(query_sql.encode()).hexdigest()
+        )
+        if not self.refresh_count:
+            count = cache.get(cache_key)
+            if count is not None:
+                return count
+        count = self.object_list.count()
+        cache.set(cache_key, count, PAGE_COUNT_CACHE_TIMEOUT)
+        return count
+
+    def _estimate_count(self):
+        """Оценка количества строк из статистики PostgreSQL."""
+        query = getattr(self.object_list, 'query', None)
+        if query is None or query.where:
+            return None
+        connection = connections[self.object_list.db or DEFAULT_DB_ALIAS]
+        if connection.vendor != 'postgresql':
+            return None
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT reltuples::bigint FROM pg_class WHERE relname = %s',
+                [query.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        return row[0] if row else None
 
 
 class CustomPagination(PageNumberPagination):
@@ -10,3 +74,12 @@ class CustomPagination(PageNumberPagination):
 
     page_size = DEFAULT_PAGE_SIZE
     page_size_query_param = 'limit'
+    django_paginator_class = EstimatedCountPaginator
+
+    def paginate_queryset(self, queryset, request, view=None):
+        page_number = request.query_params.get(self.page_query_param) or '1'
+        self.django_paginator_class = partial(
+            EstimatedCountPaginator,
+            refresh_count=page_number == '1',
+        )
+        return super().paginate_queryset(queryset, request, view)
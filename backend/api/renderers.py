@@ -0,0 +1,25 @@
+"""Кастомные рендереры API."""
+
+import orjson
+from rest_framework.renderers import JSONRenderer
+
+
+class ORJSONRenderer(JSONRenderer):
+    """JSON-рендерер на базе orjson.
+
+    orjson сериализует вложенные структуры в несколько раз быстрее
+    stdlib json; незнакомые типы (Decimal, ленивые строки) приводятся
+    к строке через default=str. OPT_NON_STR_KEYS нужен для ошибок
+    валидации DRF с целочисленными ключами-индексами
+    ({'ingredients': {0: ...}}) — stdlib json приводит такие ключи к
+    строкам, orjson без этой опции падает с TypeError.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return orjson.dumps(
+            data,
+            default=str,
+            option=orjson.OPT_NON_STR_KEYS,
+        )
@@ -2,6 +2,7 @@
 
 from django.contrib.auth import get_user_model
 from django.db import transaction
+from django.db.models import prefetch_related_objects
 from djoser.serializers import UserSerializer as DjoserUserSerializer
 from djoser.serializers import (
     UserCreateSerializer as DjoserUserCreateSerializer,
@@ -13,11 +14,11 @@ from recipes.models import (
     Ingredient,
     Recipe,
     RecipeIngredient,
-    Favorite,
-    ShoppingCart,
 )
+from recipes.cache import ingredient_map, tag_map
 from users.models import Subscription
-from .fields import Base64ImageField
+from core.constants import BULK_CREATE_BATCH_SIZE
+from .fields import Base64ImageField, CachedPrimaryKeyRelatedField
 
 User = get_user_model()
 
@@ -34,7 +35,40 @@ class AvatarSerializer(serializers.ModelSerializer):
         fields = ('avatar',)
 
 
-class UserSerializer(DjoserUserSerializer):
+class IsSubscribedMixin:
+    """Миксин вычисления флага подписки текущего пользователя."""
+
+    @property
+    def current_user(self):
+        """Аутентифицированный пользователь запроса (кэш на сериализатор)."""
+        if not hasattr(self, '_current_user'):
+            request = self.context.get('request')
+            user = getattr(request, 'user', None)
+            self._current_user = (
+                user if user is not None and user.is_authenticated else None
+            )
+        return self._current_user
+
+    def get_is_subscribed(self, obj):
+        """Проверка подписки текущего пользователя на автора."""
+        is_subscribed = getattr(obj, 'is_subscribed', None)
+        if is_subscribed is not None:
+            return is_subscribed
+        user = self.current_user
+        if user is None:
+            return False
+        subscribed_ids = self.context.get('subscribed_author_ids')
+        if subscribed_ids is None:
+            subscribed_ids = frozenset(
+                Subscription.objects.filter(user=user).values_list(
+                    'author_id', flat=True
+                )
+            )
+            self.context['subscribed_author_ids'] = subscribed_ids
+        return obj.pk in subscribed_ids
+
+
+class UserSerializer(IsSubscribedMixin, DjoserUserSerializer):
     """Сериализатор пользователя."""
 
     is_subscribed = serializers.SerializerMethodField()
@@ -51,16 +85,21 @@ class UserSerializer(DjoserUserSerializer):
             'avatar',
         )
 
-    def get_is_subscribed(self, obj):
-        """Проверка подписки текущего пользователя на автора."""
-        request = self.context.get('request')
-        return (
-            request
-            and request.user.is_authenticated
-            and Subscription.objects.filter(
-                user=request.user, author=obj
-            ).exists()
-        )
+
+class UserReadSerializer(IsSubscribedMixin, serializers.Serializer):
+    """Облегчённый сериализатор пользователя для горячих путей чтения.
+
+    Обходит привязку полей ModelSerializer/Djoser: все поля объявлены
+    явно и только на чтение.
+    """
+
+    email = serializers.ReadOnlyField()
+    id = serializers.ReadOnlyField()
+    username = serializers.ReadOnlyField()
+    first_name = serializers.ReadOnlyField()
+    last_name = serializers.ReadOnlyField()
+    is_subscribed = serializers.SerializerMethodField()
+    avatar = serializers.ImageField(read_only=True)
 
 
 class UserCreateSerializer(DjoserUserCreateSerializer):
@@ -115,7 +154,10 @@ class IngredientInRecipeSerializer(serializers.ModelSerializer):
 class IngredientInRecipeWriteSerializer(serializers.Serializer):
     """Сериализатор ингредиентов для записи рецепта."""
 
-    id = serializers.PrimaryKeyRelatedField(queryset=Ingredient.objects.all())
+    id = CachedPrimaryKeyRelatedField(
+        map_getter=ingredient_map,
+        queryset=Ingredient.objects.all(),
+    )
     amount = serializers.IntegerField(min_value=1, max_value=32000)
 
 
@@ -129,59 +171,21 @@ class RecipeMinifiedSerializer(serializers.ModelSerializer):
         fields = ('id', 'name', 'image', 'cooking_time')
 
 
-class UserRecipeBaseSerializer(serializers.ModelSerializer):
-    """Базовый сериализатор для избранного и корзины."""
-
-    class Meta:
-        fields = ('user', 'recipe')
-        read_only_fields = ('user',)
-
-    def validate(self, data):
-        """Валидация: проверка на дубликат."""
-        user = self.context['request'].user
-        recipe = data['recipe']
-        if self.Meta.model.objects.filter(user=user, recipe=recipe).exists():
-            raise serializers.ValidationError(
-                {'errors': 'Рецепт уже добавлен'}
-            )
-        return data
-
-    def create(self, validated_data):
-        """Создание записи."""
-        validated_data['user'] = self.context['request'].user
-        return super().create(validated_data)
-
-    def to_representation(self, instance):
-        """Возврат данных рецепта."""
-        return RecipeMinifiedSerializer(instance.recipe).data
-
-
-class FavoriteSerializer(UserRecipeBaseSerializer):
-    """Сериализатор избранного."""
-
-    class Meta(UserRecipeBaseSerializer.Meta):
-        model = Favorite
-
-
-class ShoppingCartSerializer(UserRecipeBaseSerializer):
-    """Сериализатор корзины."""
-
-    class Meta(UserRecipeBaseSerializer.Meta):
-        model = ShoppingCart
-
-
 class RecipeReadSerializer(serializers.ModelSerializer):
     """Сериализатор рецепта для чтения."""
 
     tags = TagSerializer(many=True, read_only=True)
-    author = UserSerializer(read_only=True)
+    author = UserReadSerializer(read_only=True)
     ingredients = IngredientInRecipeSerializer(
         source='recipe_ingredients',
         many=True,
         read_only=True,
     )
-    is_favorited = serializers.SerializerMethodField()
-    is_in_shopping_cart = serializers.SerializerMethodField()
+    is_favorited = serializers.BooleanField(read_only=True, default=False)
+    is_in_shopping_cart = serializers.BooleanField(
+        read_only=True,
+        default=False,
+    )
 
     class Meta:
         model = Recipe
@@ -198,29 +202,12 @@ class RecipeReadSerializer(serializers.ModelSerializer):
             'cooking_time',
         )
 
-    def get_is_favorited(self, obj):
-        """Проверка добавления в избранное."""
-        request = self.context.get('request')
-        return (
-            request
-            and request.user.is_authenticated
-            and obj.in_favorites.filter(user=request.user).exists()
-        )
-
-    def get_is_in_shopping_cart(self, obj):
-        """Проверка добавления в корзину."""
-        request = self.context.get('request')
-        return (
-            request
-            and request.user.is_authenticated
-            and obj.in_shoppingcarts.filter(user=request.user).exists()
-        )
-
 
 class RecipeWriteSerializer(serializers.ModelSerializer):
     """Сериализатор рецепта для создания/обновления."""
 
-    tags = serializers.PrimaryKeyRelatedField(
+    tags = CachedPrimaryKeyRelatedField(
+        map_getter=tag_map,
         queryset=Tag.objects.all(),
         many=True,
     )
@@ -252,30 +239,82 @@ class RecipeWriteSerializer(serializers.ModelSerializer):
                 {'tags': 'Нужен хотя бы один тег'}
             )
 
-        ingredient_ids = [item['id'].id for item in ingredients]
-        if len(ingredient_ids) != len(set(ingredient_ids)):
-            raise serializers.ValidationError(
-                {'ingredients': 'Ингредиенты не должны повторяться'}
-            )
-
-        if len(tags) != len(set(tags)):
-            raise serializers.ValidationError(
-                {'tags': 'Теги не должны повторяться'}
-            )
+        seen_ingredients = set()
+        for item in ingredients:
+            ingredient_id = item['id'].id
+            if ingredient_id in seen_ingredients:
+                raise serializers.ValidationError(
+                    {'ingredients': 'Ингредиенты не должны повторяться'}
+                )
+            seen_ingredients.add(ingredient_id)
+
+        seen_tags = set()
+        for tag in tags:
+            if tag.pk in seen_tags:
+                raise serializers.ValidationError(
+                    {'tags': 'Теги не должны повторяться'}
+                )
+            seen_tags.add(tag.pk)
 
         return data
 
     @staticmethod
     def _create_ingredients(recipe, ingredients):
         """Создание связей ингредиентов с рецептом."""
-        RecipeIngredient.objects.bulk_create([
-            RecipeIngredient(
-                recipe=recipe,
-                ingredient=item['id'],
-                amount=item['amount'],
+        RecipeIngredient.objects.bulk_create(
+            [
+                RecipeIngredient(
+                    recipe=recipe,
+                    ingredient=item['id'],
+                    amount=item['amount'],
+                )
+                for item in ingredients
+            ],
+            batch_size=BULK_CREATE_BATCH_SIZE,
+            ignore_conflicts=True,
+        )
+
+    @staticmethod
+    def _sync_ingredients(recipe, ingredients):
+        """Приведение ингредиентов рецепта к новому набору.
+
+        Вместо полного DELETE + INSERT удаляются только лишние связи,
+        изменившиеся количества обновляются через bulk_update, новые
+        связи создаются через bulk_create.
+        """
+        existing = {
+            link.ingredient_id: link
+            for link in recipe.recipe_ingredients.all()
+        }
+        recipe.recipe_ingredients.exclude(
+            ingredient_id__in=[item['id'].id for item in ingredients]
+        ).delete()
+
+        new_links = []
+        changed_links = []
+        for item in ingredients:
+            link = existing.get(item['id'].id)
+            if link is None:
+                new_links.append(RecipeIngredient(
+                    recipe=recipe,
+                    ingredient=item['id'],
+                    amount=item['amount'],
+                ))
+            elif link.amount != item['amount']:
+                link.amount = item['amount']
+                changed_links.append(link)
+        if changed_links:
+            RecipeIngredient.objects.bulk_update(
+                changed_links,
+                ['amount'],
+                batch_size=BULK_CREATE_BATCH_SIZE,
+            )
+        if new_links:
+            RecipeIngredient.objects.bulk_create(
+                new_links,
+                batch_size=BULK_CREATE_BATCH_SIZE,
+                ignore_conflicts=True,
             )
-            for item in ingredients
-        ])
 
     @transaction.atomic
     def create(self, validated_data):
@@ -288,6 +327,8 @@ class RecipeWriteSerializer(serializers.ModelSerializer):
         )
         recipe.tags.set(tags)
         self._create_ingredients(recipe, ingredients)
+        recipe.is_favorited = False
+        recipe.is_in_shopping_cart = False
         return recipe
 
     @transaction.atomic
@@ -298,64 +339,45 @@ class RecipeWriteSerializer(serializers.ModelSerializer):
 
         instance = super().update(instance, validated_data)
         instance.tags.set(tags)
-        instance.recipe_ingredients.all().delete()
-        self._create_ingredients(instance, ingredients)
+        self._sync_ingredients(instance, ingredients)
 
         return instance
 
     def to_representation(self, instance):
-        """Возврат данных через сериализатор для чтения."""
+        """Возврат данных через сериализатор для чтения.
+
+        Рецепт не перечитывается из базы: связи подтягиваются одним
+        prefetch на уже имеющийся объект, флаги считаются точечными
+        exists-запросами, если не были выставлены ранее.
+        """
+        if getattr(instance, '_prefetched_objects_cache', None):
+            instance._prefetched_objects_cache = {}
+        prefetch_related_objects([instance], 'tags', 'recipe_ingredients')
+        if not hasattr(instance, 'is_favorited'):
+            user = self.context['request'].user
+            instance.is_favorited = user.favorites.filter(
+                recipe=instance
+            ).exists()
+            instance.is_in_shopping_cart = user.shoppingcarts.filter(
+                recipe=instance
+            ).exists()
         return RecipeReadSerializer(instance, context=self.context).data
 
 
 class ShortLinkSerializer(serializers.Serializer):
     """Сериализатор короткой ссылки."""
 
-    short_link = serializers.SerializerMethodField()
-
-    def get_short_link(self, obj):
-        """Генерация абсолютной короткой ссылки."""
-        request = self.context.get('request')
-        return request.build_absolute_uri(f'/s/{obj.short_link}/')
-
     def to_representation(self, instance):
-        """Переименовываем short_link в short-link."""
-        data = super().to_representation(instance)
-        data['short-link'] = data.pop('short_link')
-        return data
+        """Формирование абсолютной короткой ссылки."""
+        base = self.context.get('short_link_base')
+        if base is None:
+            base = self.context['request'].build_absolute_uri('/s/')
+            self.context['short_link_base'] = base
+        return {'short-link': f'{base}{instance.short_link}/'}
 
 
 # ========== SUBSCRIPTION SERIALIZERS ==========
 
-class SubscriptionSerializer(serializers.ModelSerializer):
-    """Сериализатор для создания подписки."""
-
-    class Meta:
-        model = Subscription
-        fields = ('user', 'author')
-        read_only_fields = ('user',)
-
-    def validate(self, data):
-        """Валидация подписки."""
-        user = self.context['request'].user
-        author = data['author']
-
-        if user == author:
-            raise serializers.ValidationError(
-                {'errors': 'Нельзя подписаться на себя'}
-            )
-        if Subscription.objects.filter(user=user, author=author).exists():
-            raise serializers.ValidationError(
-                {'errors': 'Вы уже подписаны'}
-            )
-        return data
-
-    def create(self, validated_data):
-        """Создание подписки."""
-        validated_data['user'] = self.context['request'].user
-        return super().create(validated_data)
-
-
 class UserWithRecipesSerializer(UserSerializer):
     """Сериализатор пользователя с рецептами."""
 
@@ -367,10 +389,12 @@ class UserWithRecipesSerializer(UserSerializer):
 
     def get_recipes(self, obj):
         """Получение рецептов пользователя с лимитом."""
-        request = self.context.get('request')
-        recipes = obj.recipes.all()
-        if request:
-            recipes_limit = request.query_params.get('recipes_limit')
-            if recipes_limit and recipes_limit.isdigit():
-                recipes = recipes[:int(recipes_limit)]
+        recipes = getattr(obj, 'limited_recipes', None)
+        if recipes is None:
+            request = self.context.get('request')
+            recipes = obj.recipes.all()
+            if request:
+                recipes_limit = request.query_params.get('recipes_limit')
+                if recipes_limit and recipes_limit.isdigit():
+                    recipes = recipes[:int(recipes_limit)]
         return RecipeMinifiedSerializer(recipes, many=True).data
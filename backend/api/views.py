@@ -1,18 +1,31 @@
 """ViewSets API."""
 
 from datetime import datetime
-from io import BytesIO
+from functools import lru_cache
 from pathlib import Path
+from tempfile import SpooledTemporaryFile
 
 from django.contrib.auth import get_user_model
-from django.db.models import Count, Sum
-from django.http import FileResponse
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import (
+    BooleanField,
+    Count,
+    Exists,
+    F,
+    OuterRef,
+    Prefetch,
+    Value,
+    Window,
+)
+from django.db.models.functions import RowNumber
+from django.http import FileResponse, Http404, HttpResponsePermanentRedirect
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.pdfgen import canvas
-from django.shortcuts import get_object_or_404, redirect
+from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 from djoser.views import UserViewSet as DjoserUserViewSet
 from rest_framework import status, viewsets
@@ -23,11 +36,16 @@ from rest_framework.permissions import (
 )
 from rest_framework.response import Response
 
+from core.constants import (
+    PDF_INGREDIENTS_CHUNK_SIZE,
+    PDF_SPOOL_MAX_SIZE,
+    TAG_LIST_CACHE_KEY,
+    TAG_LIST_CACHE_TIMEOUT,
+)
 from recipes.models import (
     Tag,
     Ingredient,
     Recipe,
-    RecipeIngredient,
     Favorite,
     ShoppingCart,
 )
@@ -38,19 +56,38 @@ from .permissions import IsAuthorOrReadOnly
 from .serializers import (
     TagSerializer,
     IngredientSerializer,
+    RecipeMinifiedSerializer,
     RecipeReadSerializer,
     RecipeWriteSerializer,
     ShortLinkSerializer,
     UserSerializer,
     UserWithRecipesSerializer,
-    SubscriptionSerializer,
-    FavoriteSerializer,
-    ShoppingCartSerializer,
     AvatarSerializer,
 )
 
 User = get_user_model()
 
+FONTS_DIR = Path(__file__).resolve().parent / 'fonts'
+
+# Палитра PDF со списком покупок (разбор hex-строк — один раз на процесс)
+PDF_COLOR_ACCENT = colors.HexColor('#4A90D9')
+PDF_COLOR_TEXT = colors.HexColor('#333333')
+PDF_COLOR_MUTED = colors.HexColor('#666666')
+PDF_COLOR_LINE = colors.HexColor('#E0E0E0')
+PDF_COLOR_ROW_BG = colors.HexColor('#F5F5F5')
+PDF_COLOR_FOOTER = colors.HexColor('#999999')
+
+
+@lru_cache(maxsize=1)
+def _register_fonts():
+    """Однократная регистрация шрифтов DejaVu для PDF."""
+    pdfmetrics.registerFont(
+        TTFont('DejaVuSans', str(FONTS_DIR / 'DejaVuSans.ttf'))
+    )
+    pdfmetrics.registerFont(
+        TTFont('DejaVuSans-Bold', str(FONTS_DIR / 'DejaVuSans-Bold.ttf'))
+    )
+
 
 class UserViewSet(DjoserUserViewSet):
     """ViewSet пользователей."""
@@ -59,6 +96,21 @@ class UserViewSet(DjoserUserViewSet):
     serializer_class = UserSerializer
     pagination_class = CustomPagination
 
+    def get_queryset(self):
+        """Queryset с аннотацией флага подписки текущего пользователя."""
+        queryset = super().get_queryset()
+        user = self.request.user
+        if user.is_authenticated:
+            return queryset.annotate(
+                is_subscribed=Exists(
+                    Subscription.objects.filter(
+                        user=user,
+                        author=OuterRef('pk'),
+                    )
+                )
+            )
+        return queryset
+
     @action(
         detail=False,
         methods=['get'],
@@ -91,6 +143,33 @@ class UserViewSet(DjoserUserViewSet):
         request.user.avatar.delete(save=True)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
+    def _users_with_recipes_count(self):
+        """Queryset пользователей с аннотацией количества рецептов."""
+        return self.get_queryset().annotate(recipes_count=Count('recipes'))
+
+    @staticmethod
+    def _limited_recipes(request):
+        """Queryset рецептов с лимитом recipes_limit на автора в SQL.
+
+        В подписках рецепты отдаются в сокращённом виде, поэтому из
+        базы берутся только нужные сериализатору колонки.
+        """
+        # select_related(None) снимает JOIN автора из менеджера —
+        # сокращённому сериализатору он не нужен.
+        recipes = Recipe.objects.select_related(None).only(
+            'id', 'name', 'image', 'cooking_time', 'author_id'
+        )
+        recipes_limit = request.query_params.get('recipes_limit')
+        if recipes_limit and recipes_limit.isdigit():
+            recipes = recipes.annotate(
+                author_row=Window(
+                    RowNumber(),
+                    partition_by=F('author_id'),
+                    order_by=F('created_at').desc(),
+                )
+            ).filter(author_row__lte=int(recipes_limit))
+        return recipes
+
     @action(
         detail=False,
         methods=['get'],
@@ -98,9 +177,15 @@ class UserViewSet(DjoserUserViewSet):
     )
     def subscriptions(self, request):
         """Получение списка подписок."""
-        subscriptions = User.objects.filter(
+        subscriptions = self._users_with_recipes_count().filter(
             subscribers__user=request.user
-        ).annotate(recipes_count=Count('recipes'))
+        ).prefetch_related(
+            Prefetch(
+                'recipes',
+                queryset=self._limited_recipes(request),
+                to_attr='limited_recipes',
+            )
+        )
         page = self.paginate_queryset(subscriptions)
         serializer = UserWithRecipesSerializer(
             page,
@@ -116,18 +201,25 @@ class UserViewSet(DjoserUserViewSet):
     )
     def subscribe(self, request, id=None):
         """Подписка/отписка от пользователя."""
-        author = get_object_or_404(User, id=id)
-
         if request.method == 'POST':
-            serializer = SubscriptionSerializer(
-                data={'author': author.id},
-                context={'request': request},
-            )
-            serializer.is_valid(raise_exception=True)
-            serializer.save()
-            author = User.objects.annotate(
-                recipes_count=Count('recipes')
-            ).get(id=id)
+            author = get_object_or_404(self._users_with_recipes_count(), id=id)
+            if author.pk == request.user.pk:
+                return Response(
+                    {'errors': 'Нельзя подписаться на себя'},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            try:
+                with transaction.atomic():
+                    Subscription.objects.create(
+                        user=request.user,
+                        author=author,
+                    )
+            except IntegrityError:
+                return Response(
+                    {'errors': 'Вы уже подписаны'},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            author.is_subscribed = True
             return Response(
                 UserWithRecipesSerializer(
                     author, context={'request': request}
@@ -136,6 +228,7 @@ class UserViewSet(DjoserUserViewSet):
             )
 
         # DELETE
+        author = get_object_or_404(User, id=id)
         deleted, _ = Subscription.objects.filter(
             user=request.user,
             author=author,
@@ -154,6 +247,14 @@ class TagViewSet(viewsets.ReadOnlyModelViewSet):
     serializer_class = TagSerializer
     pagination_class = None
 
+    def list(self, request, *args, **kwargs):
+        """Список тегов напрямую из values() без ModelSerializer."""
+        tags = cache.get(TAG_LIST_CACHE_KEY)
+        if tags is None:
+            tags = list(self.get_queryset().values('id', 'name', 'slug'))
+            cache.set(TAG_LIST_CACHE_KEY, tags, TAG_LIST_CACHE_TIMEOUT)
+        return Response(tags)
+
 
 class IngredientViewSet(viewsets.ReadOnlyModelViewSet):
     """ViewSet ингредиентов (только чтение)."""
@@ -164,16 +265,41 @@ class IngredientViewSet(viewsets.ReadOnlyModelViewSet):
     filterset_class = IngredientFilter
     pagination_class = None
 
+    def list(self, request, *args, **kwargs):
+        """Список ингредиентов напрямую из values() без ModelSerializer."""
+        queryset = self.filter_queryset(self.get_queryset())
+        return Response(
+            list(queryset.values('id', 'name', 'measurement_unit'))
+        )
+
 
 class RecipeViewSet(viewsets.ModelViewSet):
     """ViewSet рецептов."""
 
-    queryset = Recipe.objects.all().distinct()
+    queryset = Recipe.objects.all()
     permission_classes = (IsAuthenticatedOrReadOnly, IsAuthorOrReadOnly)
     pagination_class = CustomPagination
     filter_backends = (DjangoFilterBackend,)
     filterset_class = RecipeFilter
 
+    def get_queryset(self):
+        """Queryset с аннотациями флагов избранного и корзины."""
+        user = self.request.user
+        queryset = Recipe.objects.with_related()
+        if not user.is_authenticated:
+            return queryset.annotate(
+                is_favorited=Value(False, output_field=BooleanField()),
+                is_in_shopping_cart=Value(False, output_field=BooleanField()),
+            )
+        return queryset.annotate(
+            is_favorited=Exists(
+                Favorite.objects.filter(user=user, recipe=OuterRef('pk'))
+            ),
+            is_in_shopping_cart=Exists(
+                ShoppingCart.objects.filter(user=user, recipe=OuterRef('pk'))
+            ),
+        )
+
     def get_serializer_class(self):
         """Выбор сериализатора в зависимости от действия."""
         if self.action in ('list', 'retrieve'):
@@ -187,24 +313,38 @@ class RecipeViewSet(viewsets.ModelViewSet):
         serializer = ShortLinkSerializer(recipe, context={'request': request})
         return Response(serializer.data)
 
-    def _add_to(self, serializer_class, request, pk):
-        """Добавление рецепта в модель (избранное/корзина)."""
-        serializer = serializer_class(
-            data={'recipe': pk},
-            context={'request': request},
+    def _add_to(self, model, request, pk):
+        """Добавление рецепта в модель (избранное/корзина).
+
+        Дубликат ловится по уникальному ограничению — один INSERT
+        вместо SELECT перед вставкой.
+        """
+        recipe = get_object_or_404(Recipe, pk=pk)
+        try:
+            with transaction.atomic():
+                model.objects.create(user=request.user, recipe=recipe)
+        except IntegrityError:
+            return Response(
+                {'errors': 'Рецепт уже добавлен'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return Response(
+            RecipeMinifiedSerializer(recipe).data,
+            status=status.HTTP_201_CREATED,
         )
-        serializer.is_valid(raise_exception=True)
-        serializer.save()
-        return Response(serializer.data, status=status.HTTP_201_CREATED)
 
     def _remove_from(self, model, request, pk):
-        """Удаление рецепта из модели (избранное/корзина)."""
-        recipe = get_object_or_404(Recipe, pk=pk)
+        """Удаление рецепта из модели (избранное/корзина).
+
+        Успешный путь — один DELETE; существование рецепта проверяется
+        только тогда, когда удалять оказалось нечего.
+        """
         deleted, _ = model.objects.filter(
             user=request.user,
-            recipe=recipe,
+            recipe_id=pk,
         ).delete()
         if not deleted:
+            get_object_or_404(Recipe, pk=pk)
             return Response(
                 {'errors': 'Рецепт не был добавлен'},
                 status=status.HTTP_400_BAD_REQUEST,
@@ -219,7 +359,7 @@ class RecipeViewSet(viewsets.ModelViewSet):
     def favorite(self, request, pk=None):
         """Добавление/удаление из избранного."""
         if request.method == 'POST':
-            return self._add_to(FavoriteSerializer, request, pk)
+            return self._add_to(Favorite, request, pk)
         return self._remove_from(Favorite, request, pk)
 
     @action(
@@ -231,108 +371,144 @@ class RecipeViewSet(viewsets.ModelViewSet):
     def shopping_cart(self, request, pk=None):
         """Добавление/удаление из корзины."""
         if request.method == 'POST':
-            return self._add_to(ShoppingCartSerializer, request, pk)
+            return self._add_to(ShoppingCart, request, pk)
         return self._remove_from(ShoppingCart, request, pk)
 
-    @action(
-        detail=False,
-        methods=['get'],
-        permission_classes=[IsAuthenticated],
-        url_path='download_shopping_cart',
-    )
-    def download_shopping_cart(self, request):
-        """Скачивание списка покупок в PDF."""
-        ingredients = RecipeIngredient.objects.filter(
-            recipe__in_shoppingcarts__user=request.user
-        ).values(
-            'ingredient__name',
-            'ingredient__measurement_unit',
-        ).annotate(total_amount=Sum('amount'))
-
-        buffer = BytesIO()
-        pdf = canvas.Canvas(buffer, pagesize=A4)
-        width, height = A4
-
-        fonts_dir = Path(__file__).parent / 'fonts'
-        font_path = fonts_dir / 'DejaVuSans.ttf'
-        font_path_bold = fonts_dir / 'DejaVuSans-Bold.ttf'
-        pdfmetrics.registerFont(TTFont('DejaVuSans', str(font_path)))
-        pdfmetrics.registerFont(TTFont('DejaVuSans-Bold', str(font_path_bold)))
+    @staticmethod
+    def _draw_header(pdf, width, height, username):
+        """Шапка списка покупок.
 
-        # Заголовок с фоном
-        pdf.setFillColor(colors.HexColor('#4A90D9'))
+        Формы XObject в reportlab живут внутри одного документа, поэтому
+        шапка не кэшируется между запросами, а рисуется минимальным
+        числом операторов: фон, затем весь текст одним textObject.
+        """
+        pdf.setFillColor(PDF_COLOR_ACCENT)
         pdf.rect(0, height - 80, width, 80, fill=True, stroke=False)
-        pdf.setFillColor(colors.white)
-        pdf.setFont('DejaVuSans-Bold', 28)
-        pdf.drawCentredString(width / 2, height - 55, 'Список покупок')
 
+        text = pdf.beginText()
+        # Заголовок (по центру)
+        text.setFillColor(colors.white)
+        text.setFont('DejaVuSans-Bold', 28)
+        title = 'Список покупок'
+        title_width = pdfmetrics.stringWidth(title, 'DejaVuSans-Bold', 28)
+        text.setTextOrigin((width - title_width) / 2, height - 55)
+        text.textOut(title)
         # Дата и пользователь
-        pdf.setFillColor(colors.HexColor('#666666'))
-        pdf.setFont('DejaVuSans', 10)
+        text.setFillColor(PDF_COLOR_MUTED)
+        text.setFont('DejaVuSans', 10)
         date_str = datetime.now().strftime('%d.%m.%Y')
-        pdf.drawString(50, height - 110, f'Дата: {date_str}')
-        username = request.user.username
-        pdf.drawString(50, height - 125, f'Пользователь: {username}')
+        text.setTextOrigin(50, height - 110)
+        text.textOut(f'Дата: {date_str}')
+        text.setTextOrigin(50, height - 125)
+        text.textOut(f'Пользователь: {username}')
+        pdf.drawText(text)
 
         # Разделительная линия
-        pdf.setStrokeColor(colors.HexColor('#E0E0E0'))
+        pdf.setStrokeColor(PDF_COLOR_LINE)
         pdf.setLineWidth(1)
         pdf.line(50, height - 140, width - 50, height - 140)
 
-        # Список ингредиентов
-        y = height - 170
-        row_height = 30
-        pdf.setFont('DejaVuSans', 12)
-
-        for i, item in enumerate(ingredients, 1):
-            # Чередующийся фон строк
+    @staticmethod
+    def _draw_ingredient_rows(pdf, rows, width, row_height):
+        """Отрисовка строк одной страницы списка покупок.
+
+        Однотипные операторы группируются: сначала фоны чётных строк,
+        затем весь текст одним textObject — так смена шрифта и цвета
+        выполняется по разу на страницу, а не на каждую строку.
+        """
+        if not rows:
+            return
+        pdf.setFillColor(PDF_COLOR_ROW_BG)
+        for i, y, _, _ in rows:
             if i % 2 == 0:
-                pdf.setFillColor(colors.HexColor('#F5F5F5'))
                 pdf.rect(
                     50, y - 5, width - 100, row_height, fill=True, stroke=False
                 )
 
-            # Номер
-            pdf.setFillColor(colors.HexColor('#4A90D9'))
-            pdf.setFont('DejaVuSans-Bold', 12)
-            pdf.drawString(60, y + 5, f'{i}.')
+        text = pdf.beginText()
+        # Номера
+        text.setFillColor(PDF_COLOR_ACCENT)
+        text.setFont('DejaVuSans-Bold', 12)
+        for i, y, _, _ in rows:
+            text.setTextOrigin(60, y + 5)
+            text.textOut(f'{i}.')
+        # Названия ингредиентов
+        text.setFillColor(PDF_COLOR_TEXT)
+        text.setFont('DejaVuSans', 12)
+        for _, y, name, _ in rows:
+            text.setTextOrigin(90, y + 5)
+            text.textOut(name)
+        # Количества (справа)
+        text.setFont('DejaVuSans-Bold', 12)
+        for _, y, _, amount in rows:
+            amount_width = pdfmetrics.stringWidth(
+                amount, 'DejaVuSans-Bold', 12
+            )
+            text.setTextOrigin(width - 60 - amount_width, y + 5)
+            text.textOut(amount)
+        pdf.drawText(text)
 
-            # Название ингредиента
-            pdf.setFillColor(colors.HexColor('#333333'))
-            pdf.setFont('DejaVuSans', 12)
-            pdf.drawString(90, y + 5, item['ingredient__name'].capitalize())
+    @action(
+        detail=False,
+        methods=['get'],
+        permission_classes=[IsAuthenticated],
+        url_path='download_shopping_cart',
+    )
+    def download_shopping_cart(self, request):
+        """Скачивание списка покупок в PDF."""
+        ingredients = ShoppingCart.aggregate_for(request.user)
+
+        _register_fonts()
+        buffer = SpooledTemporaryFile(max_size=PDF_SPOOL_MAX_SIZE)
+        pdf = canvas.Canvas(buffer, pagesize=A4)
+        width, height = A4
 
-            # Количество (справа)
-            unit = item['ingredient__measurement_unit']
-            amount_text = f"{item['total_amount']} {unit}"
-            pdf.setFont('DejaVuSans-Bold', 12)
-            pdf.drawRightString(width - 60, y + 5, amount_text)
+        # Шапка
+        self._draw_header(pdf, width, height, request.user.username)
 
+        # Список ингредиентов
+        y = height - 170
+        row_height = 30
+        page_rows = []
+        total = 0
+
+        for total, item in enumerate(
+            ingredients.iterator(chunk_size=PDF_INGREDIENTS_CHUNK_SIZE), 1
+        ):
+            page_rows.append((
+                total,
+                y,
+                item['name'].capitalize(),
+                f"{item['total_amount']} {item['unit']}",
+            ))
             y -= row_height
 
             # Новая страница при необходимости
             if y < 80:
+                self._draw_ingredient_rows(pdf, page_rows, width, row_height)
+                page_rows = []
                 # Футер на текущей странице
-                pdf.setFillColor(colors.HexColor('#999999'))
+                pdf.setFillColor(PDF_COLOR_FOOTER)
                 pdf.setFont('DejaVuSans', 9)
                 footer = 'Foodgram — Продуктовый помощник'
                 pdf.drawCentredString(width / 2, 30, footer)
                 pdf.showPage()
                 y = height - 50
-                pdf.setFont('DejaVuSans', 12)
+
+        self._draw_ingredient_rows(pdf, page_rows, width, row_height)
 
         # Итоговая линия
-        pdf.setStrokeColor(colors.HexColor('#4A90D9'))
+        pdf.setStrokeColor(PDF_COLOR_ACCENT)
         pdf.setLineWidth(2)
         pdf.line(50, y, width - 50, y)
 
         # Итого
-        pdf.setFillColor(colors.HexColor('#333333'))
+        pdf.setFillColor(PDF_COLOR_TEXT)
         pdf.setFont('DejaVuSans-Bold', 14)
-        pdf.drawString(60, y - 25, f'Всего позиций: {len(list(ingredients))}')
+        pdf.drawString(60, y - 25, f'Всего позиций: {total}')
 
         # Футер
-        pdf.setFillColor(colors.HexColor('#999999'))
+        pdf.setFillColor(PDF_COLOR_FOOTER)
         pdf.setFont('DejaVuSans', 9)
         pdf.drawCentredString(width / 2, 30, 'Foodgram — Продуктовый помощник')
 
@@ -347,5 +523,9 @@ class RecipeViewSet(viewsets.ModelViewSet):
 
 def short_link_redirect(request, short_link):
     """Редирект по короткой ссылке."""
-    recipe = get_object_or_404(Recipe, short_link=short_link)
-    return redirect(f'/recipes/{recipe.id}/')
+    recipe_id = Recipe.objects.filter(
+        short_link=short_link
+    ).values_list('id', flat=True).first()
+    if recipe_id is None:
+        raise Http404
+    return HttpResponsePermanentRedirect(f'/recipes/{recipe_id}/')
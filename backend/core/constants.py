@@ -24,8 +24,22 @@ MAX_COOKING_TIME = 32000
 MIN_INGREDIENT_AMOUNT = 1
 MAX_INGREDIENT_AMOUNT = 32000
 
+# Массовые операции
+BULK_CREATE_BATCH_SIZE = 500
+
 # Короткие ссылки
-SHORT_LINK_LENGTH = 6
+SHORT_LINK_LENGTH = 8
+SHORT_LINK_MAX_ATTEMPTS = 3
 
 # Пагинация
 DEFAULT_PAGE_SIZE = 6
+ESTIMATED_COUNT_MIN_ROWS = 1000
+PAGE_COUNT_CACHE_TIMEOUT = 60
+
+# Скачивание списка покупок
+PDF_SPOOL_MAX_SIZE = 1024 * 1024
+PDF_INGREDIENTS_CHUNK_SIZE = 500
+
+# Кэширование
+TAG_LIST_CACHE_KEY = 'tag_list'
+TAG_LIST_CACHE_TIMEOUT = 60 * 60
@@ -37,6 +37,10 @@ class RecipeIngredientInline(admin.TabularInline):
     extra = 1
     min_num = 1
 
+    def get_queryset(self, request):
+        """Queryset с подгрузкой ингредиентов одним JOIN."""
+        return super().get_queryset(request).select_related('ingredient')
+
 
 @admin.register(Recipe)
 class RecipeAdmin(admin.ModelAdmin):
@@ -51,16 +55,12 @@ class RecipeAdmin(admin.ModelAdmin):
         'created_at',
     )
     list_filter = ('tags', 'author')
+    list_select_related = ('author',)
     search_fields = ('name', 'author__username')
-    readonly_fields = ('favorites_count', 'short_link')
+    readonly_fields = ('favorites_count', 'shopping_carts_count', 'short_link')
     filter_horizontal = ('tags',)
     inlines = [RecipeIngredientInline]
 
-    @admin.display(description='В избранном')
-    def favorites_count(self, obj):
-        """Количество добавлений в избранное."""
-        return obj.in_favorites.count()
-
 
 @admin.register(Favorite)
 class FavoriteAdmin(admin.ModelAdmin):
@@ -68,6 +68,7 @@ class FavoriteAdmin(admin.ModelAdmin):
 
     list_display = ('id', 'user', 'recipe')
     list_filter = ('user',)
+    list_select_related = ('user', 'recipe')
     search_fields = ('user__username', 'recipe__name')
 
 
@@ -77,4 +78,5 @@ class ShoppingCartAdmin(admin.ModelAdmin):
 
     list_display = ('id', 'user', 'recipe')
     list_filter = ('user',)
+    list_select_related = ('user', 'recipe')
     search_fields = ('user__username', 'recipe__name')
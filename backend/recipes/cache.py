@@ -0,0 +1,42 @@
+"""Процессные кэши справочников тегов и ингредиентов.
+
+Теги и ингредиенты — редко меняющиеся справочники, которые API читает
+на каждом создании рецепта. Карты {pk: объект} кэшируются в памяти
+процесса и пересобираются после изменения версии; версию поднимают
+сигналы в signals.py. Кэш процессный: сигналы поднимают версию только
+в воркере, выполнившем запись, поэтому потребители карт при промахе
+обязаны перепроверять pk в базе и вызывать bump_version при попадании
+(см. CachedPrimaryKeyRelatedField) — так устаревшая карта самолечится
+вместо ложного «не существует».
+"""
+
+from functools import lru_cache
+
+from .models import Ingredient, Tag
+
+_versions = {Tag: 0, Ingredient: 0}
+
+
+def bump_version(model):
+    """Инвалидация карты модели (вызывается из сигналов)."""
+    _versions[model] += 1
+
+
+@lru_cache(maxsize=1)
+def _tag_map(version):
+    return Tag.objects.in_bulk()
+
+
+@lru_cache(maxsize=1)
+def _ingredient_map(version):
+    return Ingredient.objects.in_bulk()
+
+
+def tag_map():
+    """Словарь {id: Tag} без запроса к базе на горячем пути."""
+    return _tag_map(_versions[Tag])
+
+
+def ingredient_map():
+    """Словарь {id: Ingredient} без запроса к базе на горячем пути."""
+    return _ingredient_map(_versions[Ingredient])
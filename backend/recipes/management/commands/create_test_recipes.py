@@ -1,7 +1,9 @@
 """Команда создания тестовых рецептов."""
 
 from django.core.management.base import BaseCommand
+from django.db import transaction
 
+from core.constants import BULK_CREATE_BATCH_SIZE
 from recipes.models import Recipe, Tag, Ingredient, RecipeIngredient
 from users.models import User
 
@@ -11,6 +13,7 @@ class Command(BaseCommand):
 
     help = 'Создание 10 тестовых рецептов'
 
+    @transaction.atomic
     def handle(self, *args, **options):
         # Получаем или создаем тестового пользователя
         user, created = User.objects.get_or_create(
@@ -47,21 +50,13 @@ class Command(BaseCommand):
             )
             return
 
-        # Названия рецептов
-        recipe_names = [
-            'Тестовый рецепт 1',
-            'Тестовый рецепт 2',
-            'Тестовый рецепт 3',
-            'Тестовый рецепт 4',
-            'Тестовый рецепт 5',
-            'Тестовый рецепт 6',
-            'Тестовый рецепт 7',
-            'Тестовый рецепт 8',
-            'Тестовый рецепт 9',
-            'Тестовый рецепт 10',
-        ]
+        # Названия рецептов (генератор — без промежуточного списка)
+        recipe_names = (f'Тестовый рецепт {n}' for n in range(1, 11))
+        # Короткие ссылки пачкой — одна проверка коллизий на всех
+        short_links = iter(Recipe.generate_short_links(10))
 
         created_count = 0
+        recipe_ingredients = []
         for i, name in enumerate(recipe_names):
             recipe, created = Recipe.objects.get_or_create(
                 name=name,
@@ -70,20 +65,29 @@ class Command(BaseCommand):
                     'text': f'Описание для {name}',
                     'cooking_time': 10 + i * 5,
                     'image': 'recipes/images/test.jpg',
+                    'short_link': next(short_links),
                 }
             )
             if created:
                 # Добавляем теги (разные комбинации)
                 recipe.tags.set(tags[:((i % 3) + 1)])
-                # Добавляем ингредиенты
-                for j, ingredient in enumerate(ingredients[:3]):
-                    RecipeIngredient.objects.create(
+                # Накапливаем ингредиенты для общего bulk_create
+                recipe_ingredients.extend(
+                    RecipeIngredient(
                         recipe=recipe,
                         ingredient=ingredient,
                         amount=(j + 1) * 100
                     )
+                    for j, ingredient in enumerate(ingredients[:3])
+                )
                 created_count += 1
 
+        RecipeIngredient.objects.bulk_create(
+            recipe_ingredients,
+            batch_size=BULK_CREATE_BATCH_SIZE,
+            ignore_conflicts=True,
+        )
+
         self.stdout.write(
             self.style.SUCCESS(f'Создано {created_count} тестовых рецептов')
         )
@@ -1,10 +1,11 @@
 """Команда импорта ингредиентов."""
 
 import csv
-import json
 
+import ijson
 from django.core.management.base import BaseCommand
 
+from core.constants import BULK_CREATE_BATCH_SIZE
 from recipes.models import Ingredient
 
 
@@ -29,35 +30,42 @@ class Command(BaseCommand):
             )
 
     def _import_from_json(self, file_path):
-        """Импорт из JSON."""
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-
-        ingredients = [
-            Ingredient(
-                name=item['name'],
-                measurement_unit=item['measurement_unit']
+        """Потоковый импорт из JSON."""
+        with open(file_path, 'rb') as f:
+            total = self._bulk_import(
+                Ingredient(
+                    name=item['name'],
+                    measurement_unit=item['measurement_unit']
+                )
+                for item in ijson.items(f, 'item')
             )
-            for item in data
-        ]
-        Ingredient.objects.bulk_create(ingredients, ignore_conflicts=True)
         self.stdout.write(
-            self.style.SUCCESS(
-                f'Импортировано {len(ingredients)} ингредиентов'
-            )
+            self.style.SUCCESS(f'Импортировано {total} ингредиентов')
         )
 
     def _import_from_csv(self, file_path):
-        """Импорт из CSV."""
+        """Потоковый импорт из CSV."""
         with open(file_path, 'r', encoding='utf-8') as f:
-            reader = csv.reader(f)
-            ingredients = [
+            total = self._bulk_import(
                 Ingredient(name=row[0], measurement_unit=row[1])
-                for row in reader
-            ]
-        Ingredient.objects.bulk_create(ingredients, ignore_conflicts=True)
-        self.stdout.write(
-            self.style.SUCCESS(
-                f'Импортировано {len(ingredients)} ингредиентов'
+                for row in csv.reader(f)
             )
+        self.stdout.write(
+            self.style.SUCCESS(f'Импортировано {total} ингредиентов')
         )
+
+    @staticmethod
+    def _bulk_import(ingredients):
+        """Чанкованный bulk_create: в памяти только текущий батч."""
+        total = 0
+        batch = []
+        for ingredient in ingredients:
+            batch.append(ingredient)
+            if len(batch) >= BULK_CREATE_BATCH_SIZE:
+                Ingredient.objects.bulk_create(batch, ignore_conflicts=True)
+                total += len(batch)
+                batch = []
+        if batch:
+            Ingredient.objects.bulk_create(batch, ignore_conflicts=True)
+            total += len(batch)
+        return total
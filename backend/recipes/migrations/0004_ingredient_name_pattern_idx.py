@@ -0,0 +1,38 @@
+"""Функциональный индекс для префиксного поиска ингредиентов.
+
+istartswith на PostgreSQL превращается в UPPER(name) LIKE UPPER('x%'),
+что не использует обычный btree-индекс. Индекс по выражению
+UPPER(name) с text_pattern_ops даёт диапазонное сканирование вместо
+последовательного. На других СУБД (SQLite в разработке) операция
+пропускается.
+"""
+
+from django.db import migrations
+
+CREATE_INDEX = (
+    'CREATE INDEX IF NOT EXISTS ingredient_name_pattern_idx '
+    'ON recipes_ingredient (UPPER(name::text) text_pattern_ops)'
+)
+DROP_INDEX = 'DROP INDEX IF EXISTS ingredient_name_pattern_idx'
+
+
+def add_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(CREATE_INDEX)
+
+
+def drop_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(DROP_INDEX)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0003_alter_recipe_options_remove_favorite_'
+                    'unique_favorite_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_index, drop_index),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-08-31 05:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0005_alter_ingredient_name_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='recipe',
+            name='short_link',
+            field=models.CharField(blank=True, max_length=8, unique=True, verbose_name='Короткая ссылка'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+"""Заполнение денормализованных счётчиков рецептов."""
+
+from django.db import migrations
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_counters(apps, schema_editor):
+    Recipe = apps.get_model('recipes', 'Recipe')
+    Favorite = apps.get_model('recipes', 'Favorite')
+    ShoppingCart = apps.get_model('recipes', 'ShoppingCart')
+
+    def counter_subquery(model):
+        return Coalesce(
+            Subquery(
+                model.objects.filter(recipe=OuterRef('pk'))
+                .values('recipe')
+                .annotate(total=Count('id'))
+                .values('total')
+            ),
+            0,
+        )
+
+    Recipe.objects.update(
+        favorites_count=counter_subquery(Favorite),
+        shopping_carts_count=counter_subquery(ShoppingCart),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0008_recipe_favorites_count_recipe_shopping_carts_count'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -1,10 +1,11 @@
 """Модели рецептов."""
 
-import random
+import os
 import string
 
 from django.core.validators import MinValueValidator, MaxValueValidator
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models.functions import Lower
 
 from users.models import User
 from core.constants import (
@@ -18,8 +19,14 @@ from core.constants import (
     MIN_INGREDIENT_AMOUNT,
     MAX_INGREDIENT_AMOUNT,
     SHORT_LINK_LENGTH,
+    SHORT_LINK_MAX_ATTEMPTS,
 )
 
+# Таблица перекодировки случайных байтов в URL-безопасный алфавит:
+# 64 символа (степень двойки), поэтому маска шести бит равномерна.
+SHORT_LINK_ALPHABET = (string.ascii_letters + string.digits + '-_').encode()
+SHORT_LINK_TABLE = bytes(SHORT_LINK_ALPHABET[b & 63] for b in range(256))
+
 
 class Tag(models.Model):
     """Модель тегов."""
@@ -50,6 +57,7 @@ class Ingredient(models.Model):
     name = models.CharField(
         'Название',
         max_length=MAX_INGREDIENT_NAME_LENGTH,
+        db_index=True,
     )
     measurement_unit = models.CharField(
         'Единица измерения',
@@ -71,6 +79,32 @@ class Ingredient(models.Model):
         return f'{self.name}, {self.measurement_unit}'
 
 
+class RecipeManager(models.Manager):
+    """Менеджер рецептов с автором, предзагруженным одним JOIN."""
+
+    def get_queryset(self):
+        return super().get_queryset().select_related('author')
+
+    def with_related(self):
+        """Queryset со всеми связями, которые рендерит сериализатор чтения.
+
+        Ингредиент каждой связи подтягивает менеджер RecipeIngredient,
+        поэтому явный Prefetch с queryset не нужен.
+        """
+        return self.prefetch_related('tags', 'recipe_ingredients')
+
+
+class RecipeIngredientManager(models.Manager):
+    """Менеджер связей рецепт-ингредиент с предзагрузкой ингредиента.
+
+    Рецепт намеренно не подтягивается: он тяжёлый и в местах чтения
+    связей уже известен.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().select_related('ingredient')
+
+
 class Recipe(models.Model):
     """Модель рецептов."""
 
@@ -114,28 +148,84 @@ class Recipe(models.Model):
         'Дата создания',
         auto_now_add=True,
     )
+    # Денормализованные счётчики, поддерживаются сигналами в signals.py
+    favorites_count = models.PositiveIntegerField(
+        'В избранном',
+        default=0,
+        db_index=True,
+    )
+    shopping_carts_count = models.PositiveIntegerField(
+        'В списках покупок',
+        default=0,
+        db_index=True,
+    )
+
+    objects = RecipeManager()
 
     class Meta:
         verbose_name = 'Рецепт'
         verbose_name_plural = 'Рецепты'
         ordering = ['-created_at']
         default_related_name = 'recipes'
+        # Ленивые обращения favorite.recipe и т. п. идут через
+        # менеджер с select_related('author')
+        base_manager_name = 'objects'
+        indexes = [
+            # Лента автора в порядке ordering без сортировки на стороне БД
+            models.Index(
+                fields=['author', '-created_at'],
+                name='recipe_author_created_idx',
+            ),
+        ]
 
     def __str__(self):
         return self.name
 
     def save(self, *args, **kwargs):
-        if not self.short_link:
+        if self.short_link:
+            return super().save(*args, **kwargs)
+        # Коллизию ловит уникальный индекс — предварительный SELECT
+        # не нужен: при длине 8 над base62 она практически невозможна.
+        for attempt in range(SHORT_LINK_MAX_ATTEMPTS):
             self.short_link = self._generate_short_link()
-        super().save(*args, **kwargs)
+            try:
+                with transaction.atomic():
+                    return super().save(*args, **kwargs)
+            except IntegrityError:
+                if attempt == SHORT_LINK_MAX_ATTEMPTS - 1:
+                    raise
+
+    @classmethod
+    def generate_short_links(cls, count):
+        """Пакет свободных коротких ссылок для массового создания.
+
+        Кандидаты сверяются с базой одним запросом вместо SELECT на
+        каждый рецепт — для bulk-путей, где save() не вызывается.
+        """
+        links = set()
+        while len(links) < count:
+            candidates = {
+                cls._generate_short_link()
+                for _ in range(count - len(links))
+            }
+            candidates -= set(
+                cls.objects.filter(
+                    short_link__in=candidates
+                ).values_list('short_link', flat=True)
+            )
+            links |= candidates
+        return list(links)
 
-    def _generate_short_link(self):
-        """Генерация уникальной короткой ссылки."""
-        chars = string.ascii_letters + string.digits
-        while True:
-            link = ''.join(random.choices(chars, k=SHORT_LINK_LENGTH))
-            if not Recipe.objects.filter(short_link=link).exists():
-                return link
+    @staticmethod
+    def _generate_short_link():
+        """Случайная короткая ссылка из URL-безопасного алфавита.
+
+        os.urandom + bytes.translate — один системный вызов и табличная
+        перекодировка на C, без промежуточного base64-буфера и среза.
+        """
+        return os.urandom(SHORT_LINK_LENGTH).translate(
+            SHORT_LINK_TABLE
+        ).decode('ascii')
 
 
 class RecipeIngredient(models.Model):
@@ -161,9 +251,20 @@ class RecipeIngredient(models.Model):
         ],
     )
 
+    objects = RecipeIngredientManager()
+
     class Meta:
         verbose_name = 'Ингредиент в рецепте'
         verbose_name_plural = 'Ингредиенты в рецептах'
+        indexes = [
+            # Покрывающий индекс для агрегации списка покупок
+            # (include работает на PostgreSQL, иначе игнорируется).
+            models.Index(
+                fields=['recipe', 'ingredient'],
+                include=['amount'],
+                name='ri_recipe_ingredient_amount',
+            ),
+        ]
         constraints = [
             models.UniqueConstraint(
                 fields=['recipe', 'ingredient'],
@@ -172,7 +273,11 @@ class RecipeIngredient(models.Model):
         ]
 
     def __str__(self):
-        return f'{self.ingredient.name} в {self.recipe.name}'
+        # Только локальные колонки — без ленивых запросов за FK
+        return (
+            f'Ингредиент {self.ingredient_id} '
+            f'в рецепте {self.recipe_id}: {self.amount}'
+        )
 
 
 class UserRecipeBase(models.Model):
@@ -221,3 +326,17 @@ class ShoppingCart(UserRecipeBase):
 
     def __str__(self):
         return f'{self.user} добавил {self.recipe} в корзину'
+
+    @staticmethod
+    def aggregate_for(user):
+        """Суммарные количества ингредиентов из корзины пользователя.
+
+        Одна агрегация GROUP BY в базе; группировка по нижнему регистру
+        схлопывает дубликаты вида «Соль»/«соль».
+        """
+        return RecipeIngredient.objects.filter(
+            recipe__in_shoppingcarts__user=user
+        ).values(
+            name=Lower('ingredient__name'),
+            unit=models.F('ingredient__measurement_unit'),
+        ).annotate(total_amount=models.Sum('amount')).order_by('name')
@@ -0,0 +1,46 @@
+"""Сигналы поддержки денормализованных счётчиков и кэшей справочников."""
+
+from django.core.cache import cache
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.constants import TAG_LIST_CACHE_KEY
+from .cache import bump_version
+from .models import Favorite, Ingredient, Recipe, ShoppingCart, Tag
+
+COUNTER_FIELDS = {
+    Favorite: 'favorites_count',
+    ShoppingCart: 'shopping_carts_count',
+}
+
+
+def _shift_counter(instance, delta):
+    """Атомарное изменение счётчика рецепта через F-выражение."""
+    field = COUNTER_FIELDS[type(instance)]
+    Recipe.objects.filter(pk=instance.recipe_id).update(
+        **{field: F(field) + delta}
+    )
+
+
+@receiver(post_save, sender=Favorite)
+@receiver(post_save, sender=ShoppingCart)
+def increment_recipe_counter(sender, instance, created, **kwargs):
+    if created:
+        _shift_counter(instance, 1)
+
+
+@receiver(post_delete, sender=Favorite)
+@receiver(post_delete, sender=ShoppingCart)
+def decrement_recipe_counter(sender, instance, **kwargs):
+    _shift_counter(instance, -1)
+
+
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+@receiver(post_save, sender=Ingredient)
+@receiver(post_delete, sender=Ingredient)
+def invalidate_reference_map(sender, **kwargs):
+    bump_version(sender)
+    if sender is Tag:
+        cache.delete(TAG_LIST_CACHE_KEY)
@@ -2,6 +2,7 @@
 
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from django.db.models import Count
 
 from .models import User, Subscription
 
@@ -28,13 +29,20 @@ class UserAdmin(BaseUserAdmin):
         ('Дополнительно', {'fields': ('avatar',)}),
     )
 
-    @admin.display(description='Рецепты')
+    def get_queryset(self, request):
+        """Queryset с аннотациями счётчиков — без COUNT на каждую строку."""
+        return super().get_queryset(request).annotate(
+            recipes_total=Count('recipes', distinct=True),
+            subscribers_total=Count('subscribers', distinct=True),
+        )
+
+    @admin.display(description='Рецепты', ordering='recipes_total')
     def recipes_count(self, obj):
-        return obj.recipes.count()
+        return obj.recipes_total
 
-    @admin.display(description='Подписчики')
+    @admin.display(description='Подписчики', ordering='subscribers_total')
     def subscribers_count(self, obj):
-        return obj.subscribers.count()
+        return obj.subscribers_total
 
 
 @admin.register(Subscription)
@@ -42,5 +50,6 @@ class SubscriptionAdmin(admin.ModelAdmin):
     """Админка подписок."""
 
     list_display = ('id', 'user', 'author')
-    list_filter = ('user', 'author')
+    list_select_related = ('user', 'author')
+    autocomplete_fields = ('user', 'author')
     search_fields = ('user__username', 'author__username')
@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-08-31 05:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('users', '0004_subscription_subscription_author_user_idx'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='user',
+            constraint=models.CheckConstraint(condition=models.Q(('username__regex', '^[\\w.@+-]+$')), name='username_valid_chars'),
+        ),
+    ]
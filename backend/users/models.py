@@ -50,6 +50,13 @@ class User(AbstractUser):
         verbose_name = 'Пользователь'
         verbose_name_plural = 'Пользователи'
         ordering = ['email']
+        constraints = [
+            # Инвариант держит и пути в обход валидации (bulk_create)
+            models.CheckConstraint(
+                check=models.Q(username__regex=r'^[\w.@+-]+$'),
+                name='username_valid_chars',
+            ),
+        ]
 
     def __str__(self):
         return self.username
@@ -74,6 +81,14 @@ class Subscription(models.Model):
     class Meta:
         verbose_name = 'Подписка'
         verbose_name_plural = 'Подписки'
+        indexes = [
+            # Обратный к unique (user, author) — списки подписчиков
+            # автора читаются только из индекса.
+            models.Index(
+                fields=['author', 'user'],
+                name='subscription_author_user_idx',
+            ),
+        ]
         constraints = [
             models.UniqueConstraint(
                 fields=['user', 'author'],